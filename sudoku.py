@@ -13,13 +13,21 @@ Run: python sudoku_shop.py
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import time
 import random
 import json
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 SAVE_PATH = Path("sudoku_save.json")
 
 # ---------------------------- PUZZLES ----------------------------------
@@ -29,20 +37,20 @@ PUZZLES = {
     "Easy": [
         ("530070000600195000098000060800060003400803001700020006060000280000419005000080079",
          "534678912672195348198342567859761423426853791713924856961537284287419635345286179"),
-        ("040000000060105000009030070008302900700000004006708100010080600000406090000000050",
-         "541697832867145329239831476418362957753219864926758143314985672582476391697123548"),
+        ("070004008805701000240008906608940200592130400000080009006409020000625090920003604",
+         "379264518865791342241358976618947235592136487734582169156479823483625791927813654"),
     ],
     "Medium": [
         ("000260701680070090190004500820100040004602900050003028009300074040050036703018000",
          "435269781682571493197834562826195347374682915951743628519326874248957136763418259"),
-        ("030000080006000107000009030040007500700060004003500070020100000904000600010000020",
-         "137645289496832157582719436249317568751968324863524971628153794974281653315476892"),
+        ("008000703050003408000608000500000600906010042470000900000090200791080000304075006",
+         "648951723159723468237648159512439687986517342473862915865394271791286534324175896"),
     ],
     "Hard": [
         ("000000907000420180000705026100904000050000040000507009920108000034059000507000000",
-         "812653947573492186496715326169934852258176943734527619925168734384259761567341298"),
-        ("300000000005009000200504000000700000000000030040000006000000105000030000000201000",
-         "397126584415389672286574319163798452872465931549812736638947125721653948954231867"),
+         "462831957795426183381795426173984265659312748248567319926178534834259671517643892"),
+        ("060007020004530000000961008005000080300070150900008000050100060001000000700040300",
+         "169487523874532691523961478245319786386274159917658234458123967631795842792846315"),
     ]
 }
 
@@ -100,13 +108,50 @@ def grid_index(r, c):
     return r * 9 + c
 
 def parse_grid(s):
-    return [int(ch) for ch in s]
+    return bytes(int(ch) for ch in s)
+
+# Cell text -> digit; anything else is not a valid guess
+DIGIT_MAP = {str(i): i for i in range(1, 10)}
+
+# 1 for cells in the shaded 3x3 blocks, indexed by grid_index(r, c)
+BLOCK_PARITY = [(r//3 + c//3) & 1 for r in range(9) for c in range(9)]
 
 def format_time(seconds):
     m = int(seconds) // 60
     s = int(seconds) % 60
     return f"{m:02d}:{s:02d}"
 
+def validate_puzzle(puzzle, solution):
+    # every row, column and block of the solution must hold each digit once
+    if len(puzzle) != 81 or len(solution) != 81:
+        raise ValueError("puzzle and solution must have 81 cells")
+    rows = [0]*9
+    cols = [0]*9
+    blocks = [0]*9
+    for i, v in enumerate(solution):
+        if not 1 <= v <= 9:
+            raise ValueError(f"invalid solution digit at cell {i}")
+        if puzzle[i] not in (0, v):
+            raise ValueError(f"given at cell {i} disagrees with solution")
+        r, c = divmod(i, 9)
+        bit = 1 << (v - 1)
+        rows[r] |= bit
+        cols[c] |= bit
+        blocks[(r//3)*3 + c//3] |= bit
+    if any(m != 0x1FF for m in rows + cols + blocks):
+        raise ValueError("solution is not a valid sudoku")
+
+def prepare_puzzle(puzzle, solution):
+    p, s = parse_grid(puzzle), parse_grid(solution)
+    validate_puzzle(p, s)
+    return p, s, bytes(v != 0 for v in p)
+
+# Parse and validate every puzzle once at import: (puzzle, solution, given_mask).
+PUZZLES = {
+    diff: [prepare_puzzle(p, s) for p, s in items]
+    for diff, items in PUZZLES.items()
+}
+
 # ---------------------------- STATE PERSISTENCE ------------------------
 DEFAULT_SAVE = {
     "coins": 0,
@@ -131,8 +176,8 @@ def load_state():
 
 def save_state(state):
     try:
-        with open(SAVE_PATH, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
+        with open(SAVE_PATH, "wb") as f:
+            f.write(_dumps(state))
     except Exception as e:
         print("Failed to save state:", e)
 
@@ -152,10 +197,19 @@ class SudokuApp(tk.Tk):
         self.start_time = None
         self.last_correct_time = None
         self.timer_running = False
+        self._clock_job = None
+        self._last_time_str = None
+        self._mapped = True
+        self._shop_win = None
+        self._mb = None
         self.selected = (0, 0)
-        self.given_mask = [False]*81
-        self.puzzle = [0]*81
-        self.solution = [0]*81
+        self.given_mask = bytearray(81)
+        self.puzzle = bytearray(81)
+        self.solution = bytes(81)
+        self._empties = []
+        self._empty_pos = {}
+        self._save_dirty = False
+        self._save_scheduled = False
 
         # UI
         self.configure(bg=self.skin["bg"])
@@ -164,6 +218,9 @@ class SudokuApp(tk.Tk):
         self.build_controls()
         self.apply_skin()  # apply initial skin
         self.new_game("Easy")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.bind("<Map>", self._on_map)
+        self.bind("<Unmap>", self._on_unmap)
 
     # ---------------- UI BUILDERS -----------------
     def build_topbar(self):
@@ -200,15 +257,18 @@ class SudokuApp(tk.Tk):
         self.grid_frame.pack()
 
         self.cells = [[None for _ in range(9)] for _ in range(9)]
+        self._cell_rc = {}
+        self._cell_state = {}
+        # Reject anything but a single 1-9 before Tk inserts it
+        vcmd = (self.register(lambda P: P == "" or (len(P) == 1 and P in "123456789")), "%P")
+        block_bgs = self._block_bgs()
         for r in range(9):
             for c in range(9):
-                block_bg = self.skin["block_bg"] if ((r//3 + c//3) % 2 == 1) else self.skin["grid_bg"]
-                cell_frame = tk.Frame(self.grid_frame, bg=block_bg, bd=0, relief="flat")
-                cell_frame.grid(row=r, column=c, padx=(0 if c%3 else 2, 2), pady=(0 if r%3 else 2, 2))
-
+                block_bg = block_bgs[grid_index(r, c)]
                 e = tk.Entry(
-                    cell_frame,
+                    self.grid_frame,
                     width=2,
+                    bg=block_bg,
                     justify='center',
                     font=('Arial', 18),
                     relief='flat',
@@ -216,23 +276,55 @@ class SudokuApp(tk.Tk):
                     highlightbackground=block_bg,  # background when unfocused
                     highlightcolor=block_bg,  # background when focused
                     bd=0,
-                    insertborderwidth=0  # removes tiny inner blue border around cursor
+                    insertborderwidth=0,  # removes tiny inner blue border around cursor
+                    exportselection=False,  # cell selections must not take over PRIMARY
+                    validate="key",
+                    validatecommand=vcmd
                 )
-                e.grid(row=0, column=0, ipadx=4, ipady=4)
-                e.bind("<FocusIn>", lambda ev, rr=r, cc=c: self.on_select(rr, cc))
-                e.bind("<KeyRelease>", lambda ev, rr=r, cc=c: self.on_key(rr, cc, ev))
+                e.grid(row=r, column=c, ipadx=4, ipady=4,
+                       padx=(0 if c%3 else 2, 2), pady=(0 if r%3 else 2, 2))
+                e.bindtags(("SudokuCell",) + e.bindtags())
+                self._cell_rc[str(e)] = (r, c)
+                self._cell_state[(r, c)] = {"bg": block_bg, "highlightbackground": block_bg,
+                                            "highlightcolor": block_bg}
                 self.cells[r][c] = e
 
-        # Grid lines (bold every 3)
+        # One shared binding for all cells; (r, c) is looked up from the widget
+        self.bind_class("SudokuCell", "<FocusIn>", self._on_select_evt)
+        self.bind_class("SudokuCell", "<KeyPress>", self._on_digit_evt)
+
+        # Grid lines (bold every 3), drawn on one canvas beneath the cells;
+        # colors are applied by apply_skin
+        self.grid_canvas = tk.Canvas(self.grid_frame, bd=0, highlightthickness=0)
+        self.grid_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.grid_canvas.lower()
+
+        self.grid_frame.update_idletasks()
+        # The cells are opaque, so lines go through the centre of the padding
+        # gaps, measured from the laid-out cells rather than fixed offsets
+        ox, oy = self.grid_canvas.winfo_x(), self.grid_canvas.winfo_y()
+        width, height = self.grid_canvas.winfo_width(), self.grid_canvas.winfo_height()
+        xs = self._gap_centers([(e.winfo_x() - ox, e.winfo_width()) for e in self.cells[0]], width)
+        ys = self._gap_centers([(row[0].winfo_y() - oy, row[0].winfo_height()) for row in self.cells], height)
+        self._gridline_ids = []
         for i in range(10):
             w = 3 if i % 3 == 0 else 1
-            tk.Frame(self.grid_frame, bg=self.skin["accent"], height=w, width=9*38).place(x=0, y=i*38-1)
-            tk.Frame(self.grid_frame, bg=self.skin["accent"], height=9*38, width=w).place(x=i*38-1, y=0)
+            self._gridline_ids.append(self.grid_canvas.create_line(0, ys[i], width, ys[i], width=w))
+            self._gridline_ids.append(self.grid_canvas.create_line(xs[i], 0, xs[i], height, width=w))
 
-        self.grid_frame.update_idletasks()
         # Fix size
         self.grid_frame.config(width=self.grid_frame.winfo_width(), height=self.grid_frame.winfo_height())
 
+    @staticmethod
+    def _gap_centers(spans, total):
+        # spans: (start, size) of each cell along one axis; returns the
+        # midpoints of the 10 gaps before, between and after them
+        edges = [0] + [x for start, size in spans for x in (start, start + size)] + [total]
+        return [(edges[2*i] + edges[2*i + 1]) / 2 for i in range(10)]
+
+    def _block_bgs(self):
+        return [self.skin["block_bg"] if p else self.skin["grid_bg"] for p in BLOCK_PARITY]
+
     def build_controls(self):
         ctrl = tk.Frame(self, bg=self.skin["bg"], padx=12, pady=8)
         ctrl.grid(row=2, column=0, sticky="ew")
@@ -254,71 +346,136 @@ class SudokuApp(tk.Tk):
     def on_diff_change(self, _evt=None):
         diff = self.current_diff.get()
         if diff not in self.state_data["unlocked"]:
-            messagebox.showinfo("Locked", f"{diff} is locked. Finish the previous difficulty to unlock.")
+            self._messagebox().showinfo("Locked", f"{diff} is locked. Finish the previous difficulty to unlock.")
             # revert to highest available
             allowed = self.state_data["unlocked"][-1]
             self.current_diff.set(allowed)
             return
         self.new_game(diff)
 
+    def _on_close(self):
+        self._flush_save()
+        self.destroy()
+
+    def _on_map(self, ev):
+        # Root bindings also fire for every child; only track the window itself
+        if ev.widget is not self:
+            return
+        self._mapped = True
+        if self._clock_job is None:
+            self.update_clock()
+
+    def _on_unmap(self, ev):
+        if ev.widget is self:
+            self._mapped = False
+
+    def _on_select_evt(self, ev):
+        self.on_select(*self._cell_rc[str(ev.widget)])
+
+    def _on_digit_evt(self, ev):
+        # Runs before the Entry class binding: select the current digit so
+        # the typed one replaces it instead of failing validation as "57"
+        if ev.char in DIGIT_MAP:
+            ev.widget.select_range(0, tk.END)
+
     def on_select(self, r, c):
         self.selected = (r, c)
 
-    def on_key(self, r, c, ev):
-        # Allow only 1..9, backspace, delete
-        if ev.keysym in ("BackSpace", "Delete"):
-            return
-        ch = ev.char
-        if not ch.isdigit() or ch == "0":
-            # strip invalid
-            self.cells[r][c].delete(0, tk.END)
-        else:
-            # Keep single digit
-            val = ch[-1]
-            self.cells[r][c].delete(0, tk.END)
-            self.cells[r][c].insert(0, val)
+    def _messagebox(self):
+        # Imported on first dialog, then cached
+        if self._mb is None:
+            from tkinter import messagebox
+            self._mb = messagebox
+        return self._mb
+
+    # ---------------- PERSISTENCE -----------------
+    def _mark_dirty(self):
+        # Coalesce saves: write at most once per second
+        self._save_dirty = True
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self.after(1000, self._flush_save)
+
+    def _flush_save(self):
+        self._save_scheduled = False
+        if self._save_dirty:
+            self._save_dirty = False
+            save_state(self.state_data)
 
     # ---------------- GAME LOGIC -----------------
     def new_game(self, diff):
         # choose random puzzle
-        puzzle, solution = random.choice(PUZZLES[diff])
-        self.puzzle = parse_grid(puzzle)
-        self.solution = parse_grid(solution)
-        self.given_mask = [v != 0 for v in self.puzzle]
+        puzzle, solution, given_mask = random.choice(PUZZLES[diff])
+        self.puzzle = bytearray(puzzle)
+        self.solution = solution
+        self.given_mask = bytearray(given_mask)
+        self._empties = [i for i, g in enumerate(self.given_mask) if not g]
+        self._empty_pos = {i: k for k, i in enumerate(self._empties)}
         self.score = 0
         self.score_var.set(f"Score: {self.score}")
         self.info_var.set("Fill cells. Faster correct checks = more points!")
         self.populate_grid()
         self.start_timer()
 
+    @contextmanager
+    def _batched(self):
+        # Hold the grid geometry still while cells are mutated and flush
+        # pending redraws once at the end instead of per widget change.
+        propagate = self.grid_frame.grid_propagate()
+        self.grid_frame.grid_propagate(False)
+        try:
+            yield
+        finally:
+            self.grid_frame.grid_propagate(propagate)
+            self.grid_frame.update_idletasks()
+
+    def _set(self, r, c, **kw):
+        # Only forward options that differ from what was last applied
+        cache = self._cell_state[(r, c)]
+        changed = {k: v for k, v in kw.items() if cache.get(k) != v}
+        if changed:
+            cache.update(changed)
+            self.cells[r][c].config(**changed)
+
     def populate_grid(self):
-        for r in range(9):
-            for c in range(9):
-                e = self.cells[r][c]
-                e.config(state="normal")
-                e.delete(0, tk.END)
-                idx = grid_index(r, c)
-                if self.puzzle[idx] != 0:
-                    e.insert(0, str(self.puzzle[idx]))
-                    e.config(state="disabled", disabledforeground=self.skin["given_fg"])
-                else:
-                    e.config(fg=self.skin["editable_fg"])
+        given_fg = self.skin["given_fg"]
+        editable_fg = self.skin["editable_fg"]
+        with self._batched():
+            for r in range(9):
+                for c in range(9):
+                    e = self.cells[r][c]
+                    val = self.puzzle[grid_index(r, c)]
+                    if val != 0:
+                        self._set(r, c, state="normal")
+                        e.delete(0, tk.END)
+                        e.insert(0, str(val))
+                        self._set(r, c, state="disabled", disabledforeground=given_fg)
+                    else:
+                        self._set(r, c, state="normal", fg=editable_fg)
+                        e.delete(0, tk.END)
         self.selected = (0,0)
-        self.last_correct_time = time.time()
+        self.last_correct_time = time.monotonic()
 
     def start_timer(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.timer_running = True
+        if self._clock_job is not None:
+            self.after_cancel(self._clock_job)
         self.update_clock()
 
     def stop_timer(self):
         self.timer_running = False
 
     def update_clock(self):
-        if self.timer_running and self.start_time is not None:
-            elapsed = time.time() - self.start_time
-            self.time_var.set(f"Time: {format_time(elapsed)}")
-            self.after(500, self.update_clock)
+        # Stop ticking while minimized or once the board is finished
+        self._clock_job = None
+        if not self._mapped or not self.timer_running or self.start_time is None:
+            return
+        time_str = f"Time: {format_time(time.monotonic() - self.start_time)}"
+        if time_str != self._last_time_str:
+            self._last_time_str = time_str
+            self.time_var.set(time_str)
+        self._clock_job = self.after(500, self.update_clock)
 
     def clear_selected(self):
         r, c = self.selected
@@ -333,36 +490,38 @@ class SudokuApp(tk.Tk):
         if self.given_mask[idx]:
             self.info_var.set("This is a given cell.")
             return
-        text = self.cells[r][c].get().strip()
-        if not text or not text.isdigit():
+        guess = DIGIT_MAP.get(self.cells[r][c].get().strip())
+        if guess is None:
             self.info_var.set("Enter a digit (1-9).")
             return
-        guess = int(text)
         if guess == self.solution[idx]:
             # correct
-            now = time.time()
-            delta = now - (self.last_correct_time or now)
+            now = time.monotonic()
+            last = self.last_correct_time
+            if last is None:
+                last = now
             self.last_correct_time = now
 
             # points based on speed: faster -> more
             # e.g., 20 points if within 1s, then decays down to min 1
-            pts = max(1, 20 - int(delta))
+            pts = max(1, 20 - int(now - last))
             self.score += pts
             # coins: small reward per correct guess
             self.coins += pts // 5
 
             self.state_data["coins"] = self.coins
-            save_state(self.state_data)
+            self._mark_dirty()
 
             self.score_var.set(f"Score: {self.score}")
             self.coins_var.set(f"Coins: {self.coins}")
 
             self.flash_cell(r, c, good=True)
-            self.cells[r][c].config(state="disabled", disabledforeground=self.skin["given_fg"])
+            self._set(r, c, state="disabled", disabledforeground=self.skin["given_fg"])
             self.puzzle[idx] = guess
             self.given_mask[idx] = True
+            self._remove_empty(idx)
 
-            if self.is_completed():
+            if not self._empties:
                 self.on_win()
         else:
             self.flash_cell(r, c, good=False)
@@ -372,14 +531,13 @@ class SudokuApp(tk.Tk):
             self.info_var.set("Wrong. Try again.")
 
     def flash_cell(self, r, c, good=True):
-        e = self.cells[r][c]
         color = self.skin["correct"] if good else self.skin["wrong"]
-        old_bg = e.cget("bg")
-        e.config(bg=color)
-        self.after(200, lambda: e.config(bg=old_bg))
+        # Temporary color bypasses _set so the cached bg stays the real one
+        self.cells[r][c].config(bg=color)
+        self.after(200, self._restore_bg, r, c)
 
-    def is_completed(self):
-        return all(self.puzzle[i] == self.solution[i] for i in range(81))
+    def _restore_bg(self, r, c):
+        self.cells[r][c].config(bg=self._cell_state[(r, c)]["bg"])
 
     def on_win(self):
         self.stop_timer()
@@ -399,81 +557,104 @@ class SudokuApp(tk.Tk):
             if next_diff not in self.state_data["unlocked"]:
                 self.state_data["unlocked"].append(next_diff)
                 unlock_msg = f"\nUnlocked: {next_diff}!"
-        save_state(self.state_data)
+        self._mark_dirty()
+
+        self._messagebox().showinfo("You win!", f"You completed {diff}!\nScore: {self.score}\n+{bonus} coins.{unlock_msg}")
 
-        messagebox.showinfo("You win!", f"You completed {diff}!\nScore: {self.score}\n+{bonus} coins.{unlock_msg}")
+    def _remove_empty(self, idx):
+        # swap-with-last then pop keeps removal O(1)
+        k = self._empty_pos.pop(idx)
+        last = self._empties.pop()
+        if last != idx:
+            self._empties[k] = last
+            self._empty_pos[last] = k
 
     def give_hint(self):
-        # find first empty cell and fill it with correct answer
-        empties = [i for i in range(81) if not self.given_mask[i]]
-        if not empties:
+        # pick a random empty cell and fill it with correct answer
+        if not self._empties:
             return
-        i = random.choice(empties)
+        i = random.choice(self._empties)
         r, c = divmod(i, 9)
         val = self.solution[i]
         self.cells[r][c].delete(0, tk.END)
         self.cells[r][c].insert(0, str(val))
-        self.cells[r][c].config(state="disabled", disabledforeground=self.skin["given_fg"])
+        self._set(r, c, state="disabled", disabledforeground=self.skin["given_fg"])
         self.puzzle[i] = val
         self.given_mask[i] = True
+        self._remove_empty(i)
 
         self.score = max(0, self.score - 5)
         self.score_var.set(f"Score: {self.score}")
 
-        if self.is_completed():
+        if not self._empties:
             self.on_win()
 
     # ---------------- SHOP / SKINS -----------------
     def open_shop(self):
-        win = tk.Toplevel(self)
+        # Single instance: built on first use, then just hidden and shown
+        # again, so the stored row handles always belong to the live window
+        if self._shop_win is not None and self._shop_win.winfo_exists():
+            self._shop_win.configure(bg=self.skin["bg"])
+            self._shop_win.deiconify()
+            self._shop_win.lift()
+            return
+        win = self._shop_win = tk.Toplevel(self)
         win.title("Shop — Skins")
         win.resizable(False, False)
         win.configure(bg=self.skin["bg"])
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
 
-        ttk.Label(win, text=f"Coins: {self.coins}").grid(row=0, column=0, columnspan=3, pady=(10, 10))
+        # Shares the top bar's coins text, so purchases update it automatically
+        ttk.Label(win, textvariable=self.coins_var).grid(row=0, column=0, columnspan=3, pady=(10, 10))
 
+        self._shop_widgets = {}
         row = 1
         for name in SKINS.keys():
-            if name == "Classic":
-                ttk.Label(win, text=f"{name} (Owned)").grid(row=row, column=0, padx=10, pady=6, sticky="w")
-                act_btn = ttk.Button(win, text="Activate", command=lambda n=name: self.set_skin(n))
-                act_btn.grid(row=row, column=1, padx=6)
-            else:
-                owned = (name in self.state_data["owned_skins"])
-                price = SKIN_PRICES.get(name, 0)
-                label_text = f"{name} — {('Owned' if owned else f'{price} coins')}"
-                ttk.Label(win, text=label_text).grid(row=row, column=0, padx=10, pady=6, sticky="w")
-
-                if owned:
-                    ttk.Button(win, text="Activate",
-                               command=lambda n=name: self.set_skin(n)).grid(row=row, column=1, padx=6)
-                else:
-                    ttk.Button(win, text="Buy",
-                               command=lambda n=name, p=price, w=win: self.buy_skin(n, p, w)).grid(row=row, column=1, padx=6)
+            lbl = ttk.Label(win)
+            lbl.grid(row=row, column=0, padx=10, pady=6, sticky="w")
+            btn = ttk.Button(win)
+            btn.grid(row=row, column=1, padx=6)
+            self._shop_widgets[name] = {"label": lbl, "button": btn}
+            self._refresh_shop_row(name)
             row += 1
 
         # Close
-        ttk.Button(win, text="Close", command=win.destroy).grid(row=row, column=0, columnspan=3, pady=(12, 12))
+        ttk.Button(win, text="Close", command=win.withdraw).grid(row=row, column=0, columnspan=3, pady=(12, 12))
 
-    def buy_skin(self, name, price, win):
+    def _refresh_shop_row(self, name):
+        widgets = self._shop_widgets[name]
+        if name == "Classic":
+            widgets["label"].config(text=f"{name} (Owned)")
+            widgets["button"].config(text="Activate", command=lambda n=name: self.set_skin(n))
+            return
+        owned = (name in self.state_data["owned_skins"])
+        price = SKIN_PRICES.get(name, 0)
+        widgets["label"].config(text=f"{name} — {('Owned' if owned else f'{price} coins')}")
+        if owned:
+            widgets["button"].config(text="Activate", command=lambda n=name: self.set_skin(n))
+        else:
+            widgets["button"].config(text="Buy", command=lambda n=name, p=price: self.buy_skin(n, p))
+
+    def buy_skin(self, name, price):
+        if name in self.state_data["owned_skins"]:
+            return
         if self.coins < price:
-            messagebox.showwarning("Not enough coins", "You don't have enough coins.")
+            self._messagebox().showwarning("Not enough coins", "You don't have enough coins.")
             return
         self.coins -= price
         self.state_data["coins"] = self.coins
         self.state_data["owned_skins"].append(name)
-        save_state(self.state_data)
+        self._mark_dirty()
         self.coins_var.set(f"Coins: {self.coins}")
-        messagebox.showinfo("Purchased", f"You bought '{name}'!")
-        win.destroy()
-        self.open_shop()
+        self._messagebox().showinfo("Purchased", f"You bought '{name}'!")
+        self._refresh_shop_row(name)
 
     def set_skin(self, name):
         if name not in self.state_data["owned_skins"]:
-            messagebox.showerror("Locked", "You don't own this skin yet.")
+            self._messagebox().showerror("Locked", "You don't own this skin yet.")
             return
         self.state_data["active_skin"] = name
-        save_state(self.state_data)
+        self._mark_dirty()
         self.skin = SKINS[name]
         self.apply_skin()
 
@@ -484,21 +665,21 @@ class SudokuApp(tk.Tk):
             if isinstance(child, tk.Frame):
                 child.configure(bg=self.skin["bg"])
 
-        # Grid cell colors
-        for r in range(9):
-            for c in range(9):
-                e = self.cells[r][c]
-                e.config(fg=self.skin["editable_fg"])
-                if e.cget("state") == "disabled":
-                    e.config(disabledforeground=self.skin["given_fg"])
-
-        # Draw bold grid outlines again with accent
-        for w in self.grid_frame.place_slaves():
-            w.destroy()
-        for i in range(10):
-            w = 3 if i % 3 == 0 else 1
-            tk.Frame(self.grid_frame, bg=self.skin["accent"], height=w, width=9*38).place(x=0, y=i*38-1)
-            tk.Frame(self.grid_frame, bg=self.skin["accent"], height=9*38, width=w).place(x=i*38-1, y=0)
+        block_bgs = self._block_bgs()
+        with self._batched():
+            # Grid cell colors
+            for r in range(9):
+                for c in range(9):
+                    block_bg = block_bgs[grid_index(r, c)]
+                    self._set(r, c, fg=self.skin["editable_fg"], bg=block_bg,
+                              highlightbackground=block_bg, highlightcolor=block_bg)
+                    if self._cell_state[(r, c)].get("state") == "disabled":
+                        self._set(r, c, disabledforeground=self.skin["given_fg"])
+
+            # Recolor grid outlines with accent
+            self.grid_canvas.config(bg=self.skin["grid_bg"])
+            for line_id in self._gridline_ids:
+                self.grid_canvas.itemconfig(line_id, fill=self.skin["accent"])
 
         # Update coin label color (use ttk default text color)
 